@@ -1,212 +1,1519 @@
 import asyncio
 import csv
 from pathlib import Path
-from playwright.async_api import async_playwright
 import json
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import os
+import random
+import re
+import sqlite3
+import sys
+import time
+from contextlib import ExitStack, closing, contextmanager
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+from urllib.parse import urlencode
+import httpx
+import pyarrow as pa
+import pyarrow.parquet as pq
 from dotenv import load_dotenv
 import typer
 
+try:
+    from playwright.async_api import async_playwright
+except ImportError:  # Playwright is only needed for the browser fallback transport
+    async_playwright = None
+
+
+YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+
+# YouTube Data API quota cost, in units, of one list call per endpoint
+QUOTA_COSTS = {
+    "playlistItems": 1,
+    "videos": 1,
+}
+
+# 403 reasons that clear up on their own (unlike the daily "quotaExceeded")
+RETRYABLE_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+class YouTubeAPIError(Exception):
+    """Raised when the YouTube Data API responds with an error payload."""
+
+    def __init__(self, message: str, code: int | None = None, reason: str | None = None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.reason = reason
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "YouTubeAPIError":
+        error = payload.get("error", {})
+        errors = error.get("errors") or [{}]
+        return cls(error.get("message", "Unknown error"), error.get("code"), errors[0].get("reason"))
+
+    @property
+    def retryable(self) -> bool:
+        """Whether the error is transient (rate limiting or a server-side failure)."""
+        if self.code is None:
+            return False
+        return self.code >= 500 or self.code == 429 or (self.code == 403 and self.reason in RETRYABLE_REASONS)
+
+
+class TokenBucket:
+    """Token-bucket rate limiter whose tokens are YouTube quota units."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        """
+        Args:
+            rate: Quota units refilled per second
+            capacity: Maximum burst size in units (defaults to one second of refill,
+                and never less than the costliest call, so slow rates still make progress)
+        """
+        self.rate = rate
+        self.capacity = capacity or max(rate, max(QUOTA_COSTS.values()))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, units: float = 1):
+        """Wait until ``units`` tokens are available, then take them."""
+        if units > self.capacity:
+            raise ValueError(f"Cannot acquire {units} units from a bucket holding at most {self.capacity}")
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= units:
+                    self._tokens -= units
+                    return
+                await asyncio.sleep((units - self._tokens) / self.rate)
+
+
+@dataclass
+class SchedulerStats:
+    """Per-run request counters collected by RequestScheduler."""
+
+    requests: int = 0
+    quota_units: int = 0
+    retries: int = 0
+    failures: int = 0
+    not_modified: int = 0
+    items: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.elapsed if self.elapsed else 0.0
+
+
+class Instrumentation:
+    """
+    Structured timing hook: hands event dicts to every registered sink.
+
+    Every event has ``event`` (its name) and ``at`` (seconds since the hook
+    was created), plus event-specific fields. Spans also carry ``start`` and
+    ``seconds``. With no sinks the hook is off and costs almost nothing.
+    """
+
+    def __init__(self, *sinks: Callable[[dict], None]):
+        """
+        Args:
+            sinks: Callables receiving each event dict
+        """
+        self.sinks = list(sinks)
+        self.started_at = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def emit(self, event: str, **fields):
+        if not self.sinks:
+            return
+        record = {"event": event, "at": time.monotonic() - self.started_at, **fields}
+        for sink in self.sinks:
+            sink(record)
+
+    @contextmanager
+    def span(self, event: str, **fields):
+        """Time the enclosed block and emit it as one event; fields set on the yielded dict are included."""
+        if not self.sinks:
+            yield fields
+            return
+        started = time.monotonic()
+        try:
+            yield fields
+        except BaseException as e:
+            fields["error"] = getattr(e, "reason", None) or type(e).__name__
+            raise
+        finally:
+            self.emit(event, start=started - self.started_at, seconds=time.monotonic() - started, **fields)
+
+
+class JsonLinesSink:
+    """Instrumentation sink appending each event to a file as one JSON line."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def __call__(self, event: dict):
+        self._file.write(json.dumps(event) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class RequestScheduler:
+    """
+    Run API calls under a concurrency limit and a quota-unit rate limit.
+
+    Transient failures (rate limiting, 5xx, dropped connections) are retried
+    with full-jitter exponential backoff; anything else is raised immediately.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        quota_per_second: float = 50.0,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        """
+        Args:
+            max_concurrency: Maximum number of requests in flight at once
+            quota_per_second: Sustained quota units spent per second
+            max_retries: Retries per request before giving up
+            backoff_base: Backoff ceiling in seconds for the first retry
+            backoff_max: Upper bound on any single backoff delay in seconds
+        """
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.bucket = TokenBucket(quota_per_second)
+        self.stats = SchedulerStats()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def call(self, endpoint: str, request: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Run ``request`` for ``endpoint``, charging its quota cost and retrying transient errors.
+
+        Args:
+            endpoint: API endpoint name, used to look up its quota cost
+            request: Zero-argument coroutine function performing one attempt
+        """
+        cost = QUOTA_COSTS.get(endpoint, 1)
+
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire(cost)
+            async with self._semaphore:
+                self.stats.requests += 1
+                self.stats.quota_units += cost
+                try:
+                    return await request()
+                except YouTubeAPIError as e:
+                    if not e.retryable or attempt == self.max_retries:
+                        self.stats.failures += 1
+                        raise
+                except (httpx.TransportError, asyncio.TimeoutError):
+                    if attempt == self.max_retries:
+                        self.stats.failures += 1
+                        raise
+
+            self.stats.retries += 1
+            await asyncio.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+
+
+class HttpTransport:
+    """
+    Fetch YouTube Data API responses over a shared keep-alive HTTP/2 connection pool.
+
+    The pool is opened on first use and reused by every request made while the
+    transport is entered, so concurrent requests multiplex over the same connection.
+    """
+
+    def __init__(self, max_connections: int = 10, timeout: float = 30.0):
+        """
+        Args:
+            max_connections: Upper bound on open connections in the pool
+            timeout: Per-request timeout in seconds
+        """
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.bytes_received = 0
+        self._client: httpx.AsyncClient | None = None
+        self._users = 0
+
+    async def __aenter__(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                headers={"Accept": "application/json", "Accept-Encoding": "gzip"},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=self.timeout,
+            )
+        self._users += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._users -= 1
+        if self._users == 0:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_json(self, url: str, params: dict, etag: str | None = None) -> dict | None:
+        """
+        GET an API URL and decode the JSON body (error payloads included).
+
+        Returns None when ``etag`` is given and the server answers 304 Not Modified.
+        """
+        headers = {"If-None-Match": etag} if etag else None
+        response = await self._client.get(url, params=params, headers=headers)
+        self.bytes_received += response.num_bytes_downloaded  # As sent, before decompression
+        if response.status_code == 304:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            # Proxies and load balancers can answer 5xx with an HTML body
+            return {"error": {"code": response.status_code, "message": response.text[:200]}}
+
+
+class PlaywrightTransport:
+    """
+    Fallback transport that loads API URLs in headless Chromium.
+
+    Slower and far heavier than HttpTransport; only useful when plain HTTP
+    clients are blocked. Requires the optional ``playwright`` package.
+    """
+
+    def __init__(self, max_connections: int = 10):
+        """
+        Args:
+            max_connections: Upper bound on pages loading at once
+        """
+        if async_playwright is None:
+            raise RuntimeError("Playwright transport requested but playwright is not installed")
+        self._pages = asyncio.Semaphore(max_connections)
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self.bytes_received = 0
+        self._users = 0
+
+    async def __aenter__(self):
+        if self._context is None:
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch()
+            self._context = await self._browser.new_context()
+        self._users += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._users -= 1
+        if self._users == 0:
+            await self._context.close()
+            await self._browser.close()
+            await self._playwright.stop()
+            self._playwright = self._browser = self._context = None
+
+    async def get_json(self, url: str, params: dict, etag: str | None = None) -> dict | None:
+        """Navigate to an API URL and extract the JSON from the page body."""
+        async with self._pages:
+            return await self._get_json(url, params, etag)
+
+    async def _get_json(self, url: str, params: dict, etag: str | None) -> dict | None:
+        page = await self._context.new_page()
+        try:
+            if etag:
+                await page.set_extra_http_headers({"If-None-Match": etag})
+            response = await page.goto(f"{url}?{urlencode(params)}")
+            if response is not None and response.status == 304:
+                return None
+            body = await page.evaluate("() => document.body.innerText")
+            self.bytes_received += len(body.encode())
+            try:
+                return json.loads(body)
+            except ValueError:
+                # Proxies and load balancers can answer 5xx with an HTML body
+                return {"error": {"code": response.status if response is not None else None, "message": body[:200]}}
+        finally:
+            await page.close()
+
+
+TRANSPORTS = {
+    "http": HttpTransport,
+    "playwright": PlaywrightTransport,
+}
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache for incremental refreshes.
+
+    Holds three things between runs:
+    - API responses keyed by request, with their ETags, for conditional requests
+    - The last fetched resource of every video, with when it was fetched
+    - A snapshot of each playlist's video IDs, to diff against on the next run
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            etag TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            fetched_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS videos (
+            video_id TEXT PRIMARY KEY,
+            resource TEXT NOT NULL,
+            fetched_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS snapshots (
+            playlist_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            video_id TEXT NOT NULL,
+            PRIMARY KEY (playlist_id, position)
+        );
+    """
+
+    def __init__(self, path: str | Path = "data/cache.db"):
+        """
+        Args:
+            path: SQLite database file, created if missing
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    def get_response(self, key: str) -> tuple[str, dict] | None:
+        """Return the cached (etag, payload) for a request key, if any."""
+        row = self.conn.execute("SELECT etag, payload FROM responses WHERE key = ?", (key,)).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def put_response(self, key: str, etag: str, payload: dict):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                (key, etag, json.dumps(payload), self._now()),
+            )
+
+    def get_videos(self, video_ids: list[str]) -> dict[str, tuple[dict, str]]:
+        """Return {video_id: (resource, fetched_at)} for the cached videos among ``video_ids``."""
+        if not video_ids:
+            return {}
+        placeholders = ",".join("?" * len(video_ids))
+        rows = self.conn.execute(
+            f"SELECT video_id, resource, fetched_at FROM videos WHERE video_id IN ({placeholders})",
+            video_ids,
+        )
+        return {video_id: (json.loads(resource), fetched_at) for video_id, resource, fetched_at in rows}
+
+    def put_videos(self, videos: list[dict]):
+        now = self._now()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO videos (video_id, resource, fetched_at) VALUES (?, ?, ?)",
+                [(video["id"], json.dumps(video), now) for video in videos],
+            )
+
+    def get_snapshot(self, playlist_id: str) -> list[str]:
+        """Return the playlist's video IDs as of the previous run, in playlist order."""
+        rows = self.conn.execute(
+            "SELECT video_id FROM snapshots WHERE playlist_id = ? ORDER BY position",
+            (playlist_id,),
+        )
+        return [row[0] for row in rows]
+
+    def put_snapshot(self, playlist_id: str, video_ids: list[str]):
+        with self.conn:
+            self.conn.execute("DELETE FROM snapshots WHERE playlist_id = ?", (playlist_id,))
+            self.conn.executemany(
+                "INSERT INTO snapshots (playlist_id, position, video_id) VALUES (?, ?, ?)",
+                [(playlist_id, position, video_id) for position, video_id in enumerate(video_ids)],
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+CSV_HEADER = ["video_id", "channel_name", "title", "video_description", "video_length", "video_published_datetime", "video_likes", "video_views", "number_comments"]
+MEMBERSHIP_HEADER = ["playlist_id", "video_id", "position"]
+
+
+def channel_name_of(item: dict) -> str:
+    """Channel that owns the video behind a playlist item (not the playlist owner)."""
+    return item["snippet"].get("videoOwnerChannelTitle", item["snippet"]["channelTitle"])
+
+
+# Fixed schema of the typed (Parquet) dataset
+PARQUET_SCHEMA = pa.schema([
+    ("video_id", pa.string()),
+    ("channel_name", pa.string()),
+    ("title", pa.string()),
+    ("video_description", pa.string()),
+    ("duration_seconds", pa.int64()),
+    ("video_published_datetime", pa.timestamp("s", tz="UTC")),
+    ("video_likes", pa.int64()),
+    ("video_views", pa.int64()),
+    ("number_comments", pa.int64()),
+])
+
+# The pattern also matches "P", "PT" and "P1DT", which are not durations: at least
+# one component is required and a "T" must be followed by one (checked by callers;
+# RE2 has no lookahead). Groups are named because Arrow's regex extract requires it.
+ISO_DURATION = re.compile(
+    r"P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?"
+)
+
+
+def parse_duration(iso_duration: str) -> int | None:
+    """Convert an ISO 8601 duration ("PT1H46M33S") to seconds; None if unparseable."""
+    match = ISO_DURATION.fullmatch(iso_duration or "")
+    if not match or not any(match.groups()) or iso_duration.endswith("T"):
+        return None
+    weeks, days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return (((weeks * 7 + days) * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def parse_datetime(iso_datetime: str) -> datetime | None:
+    """Parse an API timestamp ("2024-01-01T12:00:00Z") to an aware datetime; None if empty."""
+    if not iso_datetime:
+        return None
+    return datetime.fromisoformat(iso_datetime.replace("Z", "+00:00"))
+
+
+def compact_video(video: dict, channel_name: str = "") -> dict:
+    """
+    Reduce a raw ``videos`` resource to the flat record written to the dataset.
+
+    Values stay as the API returns them (string counts, ISO 8601 duration and
+    timestamp, description with its newlines); each writer converts them.
+    """
+    snippet = video.get("snippet", {})
+    stats = video.get("statistics", {})
+    content_details = video.get("contentDetails", {})
+
+    return {
+        "video_id": video.get("id", ""),
+        "channel_name": channel_name,
+        "title": snippet.get("title", ""),
+        "video_description": snippet.get("description", ""),
+        "video_length": content_details.get("duration", ""),
+        "video_published_datetime": snippet.get("publishedAt", ""),
+        "video_likes": stats.get("likeCount", "0"),
+        "video_views": stats.get("viewCount", "0"),
+        "number_comments": stats.get("commentCount", "0"),
+    }
+
+
+class CsvWriter:
+    """
+    Append records to a CSV file as they arrive, flushing after every write.
+
+    Rows go to ``<path>.tmp``, which replaces ``path`` only when the writer
+    closes cleanly: an existing dataset is updated atomically, and a failed
+    run leaves its partial rows in the temporary file.
+    """
+
+    def __init__(self, path: str | Path, columns: list[str] = CSV_HEADER):
+        """
+        Args:
+            path: Output CSV path
+            columns: Record keys to write, in column order
+        """
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.columns = list(columns)
+        self.rows = 0
+        self._file = None
+        self._writer = None
+
+    def __enter__(self):
+        self._file = open(self.tmp_path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+        return self
+
+    def write(self, records: list[dict]):
+        self._writer.writerows([self._value(record, column) for column in self.columns] for record in records)
+        self._file.flush()
+        self.rows += len(records)
+
+    @staticmethod
+    def _value(record: dict, column: str):
+        value = record.get(column, "")
+        if column == "video_description":
+            value = value.replace("\n", " ").replace("\r", " ")  # Remove newlines
+        return value
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+
+
+class ParquetWriter:
+    """
+    Write video records to a Parquet file with the fixed, typed ``PARQUET_SCHEMA``.
+
+    Counts become int64, the ISO 8601 duration becomes ``duration_seconds`` and
+    the publish date a UTC timestamp; descriptions are kept intact. Records
+    are buffered up to ``row_group_size`` and flushed as one row group, so
+    memory stays bounded. Like CsvWriter, the file is written to
+    ``<path>.tmp`` and moved into place on clean close.
+    """
+
+    def __init__(self, path: str | Path, delta: bool = False, row_group_size: int = 10_000):
+        """
+        Args:
+            path: Output Parquet path
+            delta: Add the nullable ``change`` column used by delta exports
+            row_group_size: Records buffered per row group
+        """
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.schema = PARQUET_SCHEMA.append(pa.field("change", pa.string())) if delta else PARQUET_SCHEMA
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self._buffer: list[dict] = []
+        self._writer = None
+
+    def __enter__(self):
+        self._writer = pq.ParquetWriter(self.tmp_path, self.schema, compression="zstd")
+        return self
+
+    @staticmethod
+    def _to_int(value) -> int | None:
+        return int(value) if value not in (None, "") else None
+
+    def _typed(self, record: dict) -> dict:
+        typed = {
+            "video_id": record.get("video_id"),
+            "channel_name": record.get("channel_name"),
+            "title": record.get("title"),
+            "video_description": record.get("video_description"),
+            "duration_seconds": parse_duration(record.get("video_length", "")),
+            "video_published_datetime": parse_datetime(record.get("video_published_datetime", "")),
+            "video_likes": self._to_int(record.get("video_likes")),
+            "video_views": self._to_int(record.get("video_views")),
+            "number_comments": self._to_int(record.get("number_comments")),
+        }
+        if "change" in self.schema.names:
+            typed["change"] = record.get("change")
+        return typed
+
+    def write(self, records: list[dict]):
+        self._buffer.extend(self._typed(record) for record in records)
+        self.rows += len(records)
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._writer.write_table(pa.Table.from_pylist(self._buffer, schema=self.schema))
+            self._buffer = []
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._flush()
+        self._writer.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+
+
+OUTPUT_FORMATS = ("csv", "parquet")
+
+
+class ScrapeJournal:
+    """
+    Append-only checkpoint of a scrape in progress, so a failed run can resume.
+
+    One JSON object per line:
+    - ``{"playlists": [...]}``: header naming the playlists being scraped
+    - ``{"page": playlist_id, "next": token, "items": [[video_id, channel_name, position], ...]}``:
+      a fetched playlist page; ``next`` is the page token to continue from (null after the last page)
+    - ``{"batch": [record, ...]}``: compact records of a completed stats batch
+
+    Every entry is one write plus a flush, with no per-entry fsync, so a crash loses
+    at most the line being written. A torn last line is cut off on resume.
+    """
+
+    def __init__(self, path: str | Path, playlist_ids: list[str], resume: bool = False):
+        """
+        Args:
+            path: Journal file
+            playlist_ids: Playlists of this run; must match the journal's on resume
+            resume: Load and extend an existing journal instead of starting a new one
+        """
+        self.path = Path(path)
+        self.pages: dict[str, list[list]] = {}  # Journaled items of each playlist, page by page
+        self.next_tokens: dict[str, str | None] = {}
+        self.fetched_ids: set[str] = set()
+        self.progress = 0  # Page and batch entries, loaded or recorded
+        self._length = 0
+        if resume:
+            self._load(playlist_ids)
+            self._file = open(self.path, "r+", encoding="utf-8")
+            self._file.truncate(self._length)
+            self._file.seek(self._length)
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._append({"playlists": playlist_ids})
+
+    def _entries(self):
+        """Yield (entry, end offset) for each complete line, stopping at a torn one."""
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    return
+                if not line.endswith(b"\n"):
+                    return
+                offset += len(line)
+                yield entry, offset
+
+    def _load(self, playlist_ids: list[str]):
+        for entry, offset in self._entries():
+            if "playlists" in entry and entry["playlists"] != playlist_ids:
+                raise ValueError(f"Journal {self.path} is for playlists {', '.join(entry['playlists'])}")
+            if "page" in entry:
+                self.pages.setdefault(entry["page"], []).append(entry["items"])
+                self.next_tokens[entry["page"]] = entry["next"]
+                self.progress += 1
+            if "batch" in entry:
+                self.fetched_ids.update(record["video_id"] for record in entry["batch"])
+                self.progress += 1
+            self._length = offset
+
+    def _append(self, entry: dict):
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def is_complete(self, playlist_id: str) -> bool:
+        """Whether every page of the playlist is already journaled."""
+        return playlist_id in self.next_tokens and self.next_tokens[playlist_id] is None
+
+    def resume_token(self, playlist_id: str) -> str | None:
+        return self.next_tokens.get(playlist_id)
+
+    def journaled_pages(self, playlist_id: str):
+        """Yield the playlist's journaled pages as minimal playlist items."""
+        for items in self.pages.get(playlist_id, []):
+            yield [
+                {
+                    "snippet": {"channelTitle": channel_name, **({"position": position} if position is not None else {})},
+                    "contentDetails": {"videoId": video_id},
+                }
+                for video_id, channel_name, position in items
+            ]
+
+    def journaled_batches(self):
+        """Yield the records of each journaled batch, re-read from disk rather than kept in memory."""
+        for entry, offset in self._entries():
+            if offset > self._length:
+                return
+            if "batch" in entry:
+                yield entry["batch"]
+
+    def record_page(self, playlist_id: str, items: list[dict], next_token: str | None):
+        self.progress += 1
+        self._append({
+            "page": playlist_id,
+            "next": next_token,
+            "items": [[item["contentDetails"]["videoId"], channel_name_of(item), item["snippet"].get("position")] for item in items],
+        })
+
+    def record_batch(self, records: list[dict]):
+        self.progress += 1
+        self._append({"batch": records})
+
+    def close(self):
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def remove(self):
+        """Delete the journal once the run it checkpoints has completed."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def release(self):
+        """Close the journal, deleting it if it holds no progress to resume from."""
+        if self.progress:
+            self.close()
+        else:
+            self.remove()
+
 
 class YouTubePlaylistScraper:
-    def __init__(self, playlist_id: str, api_key: str, output_filename: str | None = None):
+    def __init__(
+        self,
+        playlist_id: str,
+        api_key: str,
+        output_filename: str | None = None,
+        transport: str = "http",
+        scheduler: RequestScheduler | None = None,
+        cache: ResponseCache | None = None,
+        max_age: timedelta | None = timedelta(hours=24),
+        delta: bool = False,
+        formats: tuple[str, ...] = ("csv",),
+        base_url: str = YOUTUBE_API_URL,
+        instrumentation: Instrumentation | None = None,
+        journal: ScrapeJournal | None = None,
+    ):
         """
         Initialize the YouTube playlist scraper.
-        
+
         Args:
             playlist_id: YouTube playlist ID (from URL: list=PLAYLIST_ID)
             api_key: YouTube Data API key
             output_filename: Optional custom output filename
+            transport: Request transport, "http" (default) or "playwright"
+            scheduler: Optional request scheduler (concurrency, rate limit, retries)
+            cache: Optional response cache; enables conditional requests and
+                incremental refreshes against the previous run
+            max_age: With a cache, refetch videos whose cached stats are older than this
+                (None never refetches known videos)
+            delta: With a cache, write only added/updated/removed videos instead of
+                the full dataset
+            formats: Output formats to write, any of "csv" and "parquet"; the
+                Parquet file sits next to the CSV with a ``.parquet`` suffix
+            base_url: YouTube Data API root, e.g. a local fake server for benchmarks
+            instrumentation: Optional hook receiving request/page/batch/write timing events
+            journal: Optional checkpoint journal; pages and completed batches are
+                appended to it, and those already in it are not fetched again
         """
         self.playlist_id = playlist_id
         self.api_key = api_key
         self.output_filename = output_filename or f"playlist_{playlist_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        self.base_url = "https://www.googleapis.com/youtube/v3"
-        
+        self.base_url = base_url
+        self.scheduler = scheduler or RequestScheduler()
+        # A connection per request in flight: HTTP/1.1 servers and proxies do not multiplex
+        self.transport = TRANSPORTS[transport](max_connections=self.scheduler.max_concurrency)
+        self.cache = cache
+        self.max_age = max_age
+        self.delta = delta
+        self.formats = formats
+        self.instrumentation = instrumentation or Instrumentation()
+        self.journal = journal
+        self.failed_batches: list[list[str]] = []
+        self.changes: dict[str, str] = {}
+        self._previous: set[str] = set()
+
+    async def _get(self, endpoint: str, params: dict, cache_key: str | None = None) -> dict:
+        """
+        Call an API endpoint through the scheduler, raising on error payloads.
+
+        With a cache and a ``cache_key``, the request is made conditional on the
+        stored ETag and a 304 Not Modified reuses the stored payload.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        params = {**params, "key": self.api_key}
+        cached = self.cache.get_response(cache_key) if self.cache and cache_key else None
+
+        async def attempt():
+            with self.instrumentation.span("request", endpoint=endpoint) as event:
+                data = await self.transport.get_json(url, params, etag=cached[0] if cached else None)
+                if data is None:
+                    self.scheduler.stats.not_modified += 1
+                    event["not_modified"] = True
+                    return cached[1]
+                if "error" in data:
+                    raise YouTubeAPIError.from_payload(data)
+            if self.cache and cache_key and data.get("etag"):
+                self.cache.put_response(cache_key, data["etag"], data)
+            return data
+
+        return await self.scheduler.call(endpoint, attempt)
+
+    async def iter_playlist_pages(self, playlist_id: str | None = None, page_token: str | None = None):
+        """
+        Yield the items of each playlist page as soon as it arrives.
+
+        Pages are journaled (when there is a journal) before they are yielded.
+
+        Args:
+            playlist_id: Playlist to page through (defaults to this scraper's playlist)
+            page_token: Page to start from, e.g. a journaled ``nextPageToken``
+        """
+        page = 0
+
+        while True:
+            params = {
+                "part": "snippet,contentDetails",
+                "playlistId": playlist_id or self.playlist_id,
+                "maxResults": 50,
+            }
+            if page_token:
+                params["pageToken"] = page_token
+
+            with self.instrumentation.span("page", playlist_id=params["playlistId"], page=page) as event:
+                data = await self._get("playlistItems", params, cache_key=f"playlistItems:{params['playlistId']}:{page_token or ''}")
+                event["items"] = len(data.get("items", []))
+            page += 1
+            if self.journal:
+                self.journal.record_page(params["playlistId"], data.get("items", []), data.get("nextPageToken"))
+            yield data.get("items", [])
+
+            if "nextPageToken" not in data:
+                break
+
+            page_token = data["nextPageToken"]
+
     async def fetch_playlist_items(self):
         """Fetch all items from the playlist using YouTube API."""
         print(f"📥 Fetching playlist items for: {self.playlist_id}")
-        
+
         all_items = []
-        page_token = None
         page_count = 0
-        
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            context = await browser.new_context()
-            page = await context.new_page()
-            
+
+        async with self.transport:
             try:
-                while True:
-                    url = f"{self.base_url}/playlistItems?part=snippet,contentDetails&playlistId={self.playlist_id}&maxResults=50&key={self.api_key}"
-                    if page_token:
-                        url += f"&pageToken={page_token}"
-                    
-                    # Navigate to API endpoint to fetch JSON
-                    await page.goto(url)
-                    content = await page.content()
-                    
-                    # Extract JSON from page
-                    data = json.loads(await page.evaluate("() => document.body.innerText"))
-                    
-                    if "error" in data:
-                        print(f"❌ API Error: {data['error']['message']}")
-                        return None
-                    
-                    all_items.extend(data.get("items", []))
+                async for items in self.iter_playlist_pages():
+                    all_items.extend(items)
                     page_count += 1
                     print(f"  ✓ Page {page_count}: {len(all_items)} items total")
-                    
-                    if "nextPageToken" not in data:
-                        break
-                    
-                    page_token = data["nextPageToken"]
-                
-                print(f"✅ Fetched {len(all_items)} playlist items")
-                return all_items
-                
-            finally:
-                await context.close()
-                await browser.close()
-    
+            except YouTubeAPIError as e:
+                print(f"❌ API Error: {e.message}")
+                return None
+
+        print(f"✅ Fetched {len(all_items)} playlist items")
+        return all_items
+
+    async def fetch_video_batch(self, video_ids: list[str]) -> list[dict]:
+        """Fetch snippet, statistics and contentDetails for up to 50 videos."""
+        with self.instrumentation.span("batch", videos=len(video_ids)) as event:
+            data = await self._get("videos", {
+                "part": "snippet,statistics,contentDetails",
+                "id": ",".join(video_ids),
+            }, cache_key=f"videos:{','.join(video_ids)}")
+            items = data.get("items", [])
+            event["items"] = len(items)
+        self.scheduler.stats.items += len(items)
+        if self.cache:
+            self.cache.put_videos(items)
+        return items
+
+    def _select_for_fetch(self, video_ids: list[str]) -> tuple[list[str], list[dict]]:
+        """
+        Split video IDs into those needing a stats fetch and cached resources still fresh.
+
+        Without a cache every video is fetched. With one, only videos that are new
+        or whose cached stats are older than ``max_age`` are.
+
+        Returns:
+            Tuple of (video_ids_to_fetch, cached_videos)
+        """
+        if not self.cache:
+            return video_ids, []
+
+        known = self.cache.get_videos(video_ids)
+        # max_age=None never refetches; timedelta(0) refetches everything
+        cutoff = (datetime.now(timezone.utc) - self.max_age).isoformat(timespec="seconds") if self.max_age is not None else None
+
+        to_fetch, cached_videos = [], []
+        for video_id in video_ids:
+            entry = known.get(video_id)
+            if entry is None or (cutoff is not None and entry[1] <= cutoff):
+                to_fetch.append(video_id)
+            else:
+                cached_videos.append(entry[0])
+        return to_fetch, cached_videos
+
+    async def _fetch_video_batch_or_skip(self, video_ids: list[str]) -> list[dict]:
+        """Fetch one batch, recording it in ``failed_batches`` instead of raising."""
+        try:
+            return await self.fetch_video_batch(video_ids)
+        except (YouTubeAPIError, httpx.TransportError, asyncio.TimeoutError) as e:
+            print(f"⚠️  Skipping batch of {len(video_ids)} videos: {getattr(e, 'message', e)}")
+            self.failed_batches.append(video_ids)
+            return []
+
     async def fetch_video_stats(self, video_ids: list[str]):
-        """Fetch statistics for videos in batches."""
+        """
+        Fetch statistics for videos in concurrent batches.
+
+        A batch that still fails after retries is recorded in ``failed_batches``
+        and the videos from the remaining batches are returned.
+        """
         print(f"📊 Fetching video statistics for {len(video_ids)} videos...")
-        
+
         all_videos = []
-        
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            context = await browser.new_context()
-            page = await context.new_page()
-            
+        done = 0
+
+        async with self.transport:
+            # Process in batches of 50 (YouTube API limit)
+            batches = [video_ids[i:i+50] for i in range(0, len(video_ids), 50)]
+            for future in asyncio.as_completed([self._fetch_video_batch_or_skip(batch) for batch in batches]):
+                all_videos.extend(await future)
+                done += 1
+                print(f"  ✓ Batch {done}/{len(batches)}: {len(all_videos)}/{len(video_ids)} videos")
+
+        print(f"✅ Fetched statistics for {len(all_videos)} videos")
+        return all_videos
+
+    def _record(self, video: dict, channel_names: dict[str, str], fetched: bool) -> dict:
+        """Compact a video resource, tagging its change against the previous snapshot."""
+        record = compact_video(video, channel_names.pop(video["id"], ""))
+        if self.cache:
+            if video["id"] not in self._previous:
+                record["change"] = "added"
+            elif fetched:
+                record["change"] = "updated"
+            if "change" in record:
+                self.changes[video["id"]] = record["change"]
+        return record
+
+    async def _fetch_records(self, video_ids: list[str], channel_names: dict[str, str]) -> list[dict]:
+        videos = await self._fetch_video_batch_or_skip(video_ids)
+        records = [self._record(video, channel_names, fetched=True) for video in videos]
+        for video_id in video_ids:
+            channel_names.pop(video_id, None)  # Videos the API no longer returns (deleted/private)
+        if self.journal and records:
+            self.journal.record_batch(records)
+        return records
+
+    def _on_page(self, playlist_id: str, items: list[dict], start_position: int):
+        """Hook called with every playlist page as it arrives."""
+
+    def _on_playlist_error(self, playlist_id: str, error: Exception):
+        """Hook called when paging through a playlist fails; re-raises by default."""
+        raise error
+
+    async def iter_records(self, playlist_ids: list[str] | None = None):
+        """
+        Stream compact video records: playlist pages → stats batches → records.
+
+        Pages of every playlist are fetched concurrently. Video IDs not seen
+        before are queued, and each full 50-id ``videos?id=`` batch is sent
+        while later pages are still being fetched. Completed batches are
+        yielded in submission order. At most ``2 * max_concurrency`` batches
+        are held at once and only compact records are kept, so memory stays
+        flat whatever the playlist size. With a cache, fresh videos come from it.
+
+        With a journal from an interrupted run, its completed batches are
+        yielded first and its pages replayed. Each playlist then continues
+        from its last ``nextPageToken``, and only videos without a journaled
+        batch are fetched.
+
+        Args:
+            playlist_ids: Playlists to stream (defaults to this scraper's playlist)
+
+        Yields:
+            Lists of compact records (see ``compact_video``), one list per batch
+        """
+        playlist_ids = playlist_ids or [self.playlist_id]
+        window: asyncio.Queue = asyncio.Queue(maxsize=2 * self.scheduler.max_concurrency)
+        tasks: set[asyncio.Task] = set()
+        seen: set[str] = set()
+        pending: list[str] = []
+        channel_names: dict[str, str] = {}
+        snapshots: dict[str, list[str]] = {}
+        previous = {playlist_id: self.cache.get_snapshot(playlist_id) for playlist_id in playlist_ids} if self.cache else {}
+        self._previous = {video_id for video_ids in previous.values() for video_id in video_ids}
+        journal = self.journal
+        fetched_ids = journal.fetched_ids if journal else set()
+
+        if journal:
+            for records in journal.journaled_batches():
+                for record in records:
+                    if "change" in record:
+                        self.changes[record["video_id"]] = record["change"]
+                yield records
+
+        async def submit_batches(flush: bool = False):
+            while len(pending) >= 50 or (flush and pending):
+                batch = pending[:50]
+                del pending[:50]
+                task = asyncio.create_task(self._fetch_records(batch, channel_names))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                await window.put(task)
+
+        async def handle_page(playlist_id: str, items: list[dict], video_ids: list[str]):
+            self._on_page(playlist_id, items, len(video_ids))
+            new_ids = []
+            for item in items:
+                video_id = item["contentDetails"]["videoId"]
+                video_ids.append(video_id)
+                if video_id not in seen:
+                    seen.add(video_id)
+                    if video_id not in fetched_ids:
+                        new_ids.append(video_id)
+                        channel_names[video_id] = channel_name_of(item)
+
+            to_fetch, cached_videos = self._select_for_fetch(new_ids)
+            if cached_videos:
+                await window.put([self._record(video, channel_names, fetched=False) for video in cached_videos])
+            pending.extend(to_fetch)
+            await submit_batches()
+
+        async def page_through(playlist_id: str):
+            video_ids = []
+            try:
+                if journal:
+                    for items in journal.journaled_pages(playlist_id):
+                        await handle_page(playlist_id, items, video_ids)
+                if not (journal and journal.is_complete(playlist_id)):
+                    page_token = journal.resume_token(playlist_id) if journal else None
+                    async for items in self.iter_playlist_pages(playlist_id, page_token):
+                        await handle_page(playlist_id, items, video_ids)
+            except (YouTubeAPIError, httpx.TransportError) as e:
+                self._on_playlist_error(playlist_id, e)
+                return
+            if self.cache:
+                snapshots[playlist_id] = video_ids
+
+        async def produce():
             try:
-                # Process in batches of 50 (YouTube API limit)
-                for i in range(0, len(video_ids), 50):
-                    batch = video_ids[i:i+50]
-                    ids_string = ",".join(batch)
-                    
-                    url = f"{self.base_url}/videos?part=snippet,statistics,contentDetails&id={ids_string}&key={self.api_key}"
-                    
-                    await page.goto(url)
-                    data = json.loads(await page.evaluate("() => document.body.innerText"))
-                    
-                    if "error" in data:
-                        print(f"❌ API Error: {data['error']['message']}")
-                        return None
-                    
-                    all_videos.extend(data.get("items", []))
-                    progress = min(i + 50, len(video_ids))
-                    print(f"  ✓ Fetched {progress}/{len(video_ids)} videos")
-                
-                print(f"✅ Fetched statistics for {len(all_videos)} videos")
-                return all_videos
-                
+                with self.instrumentation.span("stage", stage="pagination", playlists=len(playlist_ids)):
+                    await asyncio.gather(*(page_through(playlist_id) for playlist_id in playlist_ids))
+                await submit_batches(flush=True)
             finally:
-                await context.close()
-                await browser.close()
-    
+                await window.put(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while (entry := await window.get()) is not None:
+                yield entry if isinstance(entry, list) else await entry
+            await producer
+        finally:
+            producer.cancel()
+            for task in list(tasks):
+                task.cancel()
+
+        if self.cache:
+            current = {video_id for video_ids in snapshots.values() for video_id in video_ids}
+            for playlist_id, video_ids in snapshots.items():
+                for video_id in set(previous[playlist_id]) - current:
+                    self.changes[video_id] = "removed"
+                self.cache.put_snapshot(playlist_id, video_ids)
+
+    def open_writers(self, stack: ExitStack) -> list:
+        """Open one writer per requested output format, closed by ``stack``."""
+        output_path = Path(self.output_filename)
+        writers = []
+        if "csv" in self.formats:
+            writers.append(stack.enter_context(CsvWriter(output_path, self._columns())))
+        if "parquet" in self.formats:
+            writers.append(stack.enter_context(ParquetWriter(output_path.with_suffix(".parquet"), delta=self.delta)))
+        return writers
+
+    async def export(self, writers: list, playlist_ids: list[str] | None = None) -> int:
+        """
+        Stream records into every writer as their batches complete.
+
+        In delta mode only added/updated videos are written, followed by a row
+        per removed video.
+
+        Returns:
+            Number of rows written
+        """
+        async with self.transport:
+            async for records in self.iter_records(playlist_ids):
+                if self.delta:
+                    records = [record for record in records if "change" in record]
+                with self.instrumentation.span("write", rows=len(records)):
+                    for writer in writers:
+                        writer.write(records)
+                print(f"  ✓ {writers[0].rows} videos written")
+
+        if self.delta:
+            removed = [{"video_id": video_id, "change": change} for video_id, change in self.changes.items() if change == "removed"]
+            for writer in writers:
+                writer.write(removed)
+
+        if self.failed_batches:
+            print(f"⚠️  {sum(map(len, self.failed_batches))} videos in {len(self.failed_batches)} failed batches were skipped")
+        if self.cache:
+            print(f"♻️  {self.scheduler.stats.not_modified} responses not modified, {len(self.changes)} videos changed")
+        return writers[0].rows
+
+    def print_stats(self):
+        """Print the per-run request counters."""
+        stats = self.scheduler.stats
+        print(f"📈 {stats.requests} requests ({stats.requests_per_second:.1f}/s), "
+              f"{stats.quota_units} quota units, {stats.retries} retries, "
+              f"{stats.items_per_second:.1f} videos/s, {self.transport.bytes_received / 1e6:.1f} MB received")
+
     def create_csv(self, videos: list[dict], playlist_items: list[dict]):
         """Create a properly formatted CSV file from video data."""
         print(f"📝 Creating CSV file...")
-        
-        rows = [
-            ["video_id", "channel_name", "title", "video_description", "video_length", "video_published_datetime", "video_likes", "video_views", "number_comments"]
-        ]
-        
+
         # Create a mapping of video_id to channel name
-        video_channel_map = {}
-        for item in playlist_items:
-            video_id = item["contentDetails"]["videoId"]
-            channel_name = item["snippet"].get("videoOwnerChannelTitle", item["snippet"]["channelTitle"])
-            video_channel_map[video_id] = channel_name
-        
-        for video in videos:
-            snippet = video.get("snippet", {})
-            stats = video.get("statistics", {})
-            content_details = video.get("contentDetails", {})
-            
-            row = [
-                video.get("id", ""),
-                video_channel_map.get(video.get("id", ""), ""),  # Channel name
-                snippet.get("title", ""),
-                snippet.get("description", "").replace("\n", " ").replace("\r", " "),  # Remove newlines
-                content_details.get("duration", ""),
-                snippet.get("publishedAt", ""),
-                stats.get("likeCount", "0"),
-                stats.get("viewCount", "0"),
-                stats.get("commentCount", "0"),
-            ]
-            rows.append(row)
-        
-        # Write CSV file
+        video_channel_map = {item["contentDetails"]["videoId"]: channel_name_of(item) for item in playlist_items}
+
         output_path = Path(self.output_filename)
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
-        
+        with CsvWriter(output_path) as writer:
+            writer.write([compact_video(video, video_channel_map.get(video.get("id", ""), "")) for video in videos])
+
         print(f"✅ CSV created: {output_path}")
-        print(f"   Total rows: {len(rows) - 1} videos")
-        
+        print(f"   Total rows: {writer.rows} videos")
+
         return output_path
-    
+
+    def finish_journal(self, complete: bool):
+        """Delete the journal after a complete run; otherwise keep it (if it saved anything) and say how to resume."""
+        if not self.journal:
+            return
+        if complete or not self.journal.progress:
+            self.journal.remove()
+        else:
+            self.journal.close()
+            print(f"💾 Progress checkpointed in {self.journal.path}")
+            print(f"   Rerun with --output {self.output_filename} --resume to continue where this run stopped")
+
+    def _columns(self) -> list[str]:
+        return CSV_HEADER + ["change"] if self.delta else CSV_HEADER
+
     async def run(self):
-        """Execute the full scraping workflow."""
+        """Execute the full scraping workflow, streaming rows to disk as they arrive."""
         print("\\n" + "="*60)
         print("🎬 YouTube Playlist to CSV Converter")
         print("="*60 + "\\n")
-        
-        # Step 1: Fetch playlist items
-        playlist_items = await self.fetch_playlist_items()
-        if not playlist_items:
-            return
-        
-        # Step 2: Extract video IDs
-        video_ids = [item["contentDetails"]["videoId"] for item in playlist_items]
-        
-        # Step 3: Fetch video statistics
-        videos = await self.fetch_video_stats(video_ids)
-        if not videos:
+
+        print(f"📥 Fetching playlist items and video statistics for: {self.playlist_id}")
+        writers = []
+        try:
+            with ExitStack() as stack:
+                writers = self.open_writers(stack)
+                await self.export(writers)
+        except (YouTubeAPIError, httpx.TransportError) as e:
+            print(f"❌ API Error: {getattr(e, 'message', e)}")
+            for writer in writers:
+                print(f"   Partial results ({writer.rows} videos) kept in: {writer.tmp_path}")
+            self.finish_journal(complete=False)
             return
-        
-        # Step 4: Create CSV
-        output_file = self.create_csv(videos, playlist_items)
-        
+
+        self.print_stats()
+        self.finish_journal(complete=not self.failed_batches)
+
+        print("\\n" + "="*60)
+        for writer in writers:
+            print(f"✨ Success! {writer.rows} videos saved to: {writer.path}")
+        print("="*60 + "\\n")
+
+
+class PlaylistBatchScraper(YouTubePlaylistScraper):
+    """
+    Scrape several playlists into one combined dataset.
+
+    Playlists are paged through concurrently and their video IDs merged into a
+    single de-duplicated set, so each unique video's stats are requested once
+    even when it appears in many playlists. Which playlists contain which
+    videos is streamed to a separate membership CSV.
+    """
+
+    def __init__(self, playlist_ids: list[str], api_key: str, output_filename: str | None = None, **options):
+        """
+        Initialize the batch scraper.
+
+        Args:
+            playlist_ids: YouTube playlist IDs to scrape
+            api_key: YouTube Data API key
+            output_filename: Optional custom output filename for the combined CSV
+            **options: Any other YouTubePlaylistScraper keyword argument (transport,
+                scheduler, cache, max_age, delta, formats, base_url, instrumentation,
+                journal); the scheduler is shared by every playlist
+        """
+        output_filename = output_filename or f"playlists_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        super().__init__("batch", api_key, output_filename, **options)
+        self.playlist_ids = list(dict.fromkeys(playlist_ids))
+        self.failed_playlists: list[str] = []
+        self.membership_filename = Path(self.output_filename).with_name(f"{Path(self.output_filename).stem}_memberships.csv")
+        self._memberships: CsvWriter | None = None
+
+    def _on_page(self, playlist_id: str, items: list[dict], start_position: int):
+        if self._memberships:
+            self._memberships.write([
+                {
+                    "playlist_id": playlist_id,
+                    "video_id": item["contentDetails"]["videoId"],
+                    "position": item["snippet"].get("position", start_position + offset),
+                }
+                for offset, item in enumerate(items)
+            ])
+
+    def _on_playlist_error(self, playlist_id: str, error: Exception):
+        print(f"❌ Playlist {playlist_id} failed: {getattr(error, 'message', error)}")
+        self.failed_playlists.append(playlist_id)
+
+    async def run(self):
+        """Execute the batch scraping workflow."""
+        print("\\n" + "="*60)
+        print("🎬 YouTube Playlists Batch to CSV Converter")
+        print("="*60 + "\\n")
+
+        print(f"📥 Fetching {len(self.playlist_ids)} playlists...")
+        with ExitStack() as stack:
+            writers = self.open_writers(stack)
+            memberships = stack.enter_context(CsvWriter(self.membership_filename, MEMBERSHIP_HEADER))
+            self._memberships = memberships
+            try:
+                await self.export(writers, self.playlist_ids)
+            finally:
+                self._memberships = None
+
+        if self.failed_playlists:
+            print(f"⚠️  {len(self.failed_playlists)} playlists failed: {', '.join(self.failed_playlists)}")
+        self.print_stats()
+        self.finish_journal(complete=not (self.failed_batches or self.failed_playlists))
+
         print("\\n" + "="*60)
-        print(f"✨ Success! CSV saved to: {output_file}")
+        for writer in writers:
+            print(f"✨ Success! {writer.rows} unique videos saved to: {writer.path}")
+        print(f"   {memberships.rows} memberships saved to: {memberships.path}")
         print("="*60 + "\\n")
 
 
-def main(playlist_id: str = typer.Argument(..., help="YouTube playlist ID to scrape")):
-    """Main entry point for the YouTube Playlist Scraper CLI."""
-    # Load environment variables
+def load_api_key() -> str:
+    """Load the YouTube Data API key from the environment (or a .env file)."""
     load_dotenv()
-    
-    # Configuration
-    API_KEY = os.getenv("YOUTUBE_API_KEY")  # Your API key from .env file
-    
-    if not API_KEY:
+
+    api_key = os.getenv("YOUTUBE_API_KEY")  # Your API key from .env file
+
+    if not api_key:
         raise ValueError("YOUTUBE_API_KEY not found in environment variables")
-    
+
+    return api_key
+
+
+def read_playlist_ids(playlist_ids: list[str] | None, playlists_file: Path | None) -> list[str]:
+    """
+    Collect playlist IDs from the command line and/or a file, dropping duplicates.
+
+    The file holds one playlist ID per line; blank lines and ``#`` comments are ignored.
+    """
+    ids = list(playlist_ids or [])
+    if playlists_file:
+        for line in playlists_file.read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                ids.append(line)
+    return list(dict.fromkeys(ids))
+
+
+app = typer.Typer(help="Download YouTube playlist data as CSV")
+
+TRANSPORT_OPTION = typer.Option("http", help="Request transport: 'http' (pooled HTTP/2) or 'playwright' (headless Chromium fallback)")
+CONCURRENCY_OPTION = typer.Option(8, help="Maximum number of API requests in flight")
+QUOTA_RATE_OPTION = typer.Option(50.0, help="Quota units spent per second (token-bucket refill rate)")
+MAX_RETRIES_OPTION = typer.Option(5, help="Retries for rate-limited or failed requests")
+INCREMENTAL_OPTION = typer.Option(False, "--incremental", help="Use the on-disk cache: conditional requests, and only fetch stats for new or stale videos")
+CACHE_PATH_OPTION = typer.Option(Path("data/cache.db"), help="Cache database used by --incremental")
+MAX_AGE_OPTION = typer.Option(24.0, help="With --incremental, refetch stats cached longer ago than this many hours")
+DELTA_OPTION = typer.Option(False, "--delta", help="With --incremental, write only added/updated/removed videos")
+OUTPUT_OPTION = typer.Option(None, "--output", "-o", help="Output CSV path; pointing at the previous dataset updates it in place")
+FORMAT_OPTION = typer.Option(["csv"], "--format", help="Output format, 'csv' and/or 'parquet' (repeatable)")
+TRACE_OPTION = typer.Option(None, "--trace", help="Append structured timing events (JSON lines) to this file")
+RESUME_OPTION = typer.Option(False, "--resume", help="Continue the interrupted run that was writing --output, from its checkpoint journal")
+RESTART_OPTION = typer.Option(False, "--restart", help="Discard the checkpoint journal of an interrupted run writing --output and start over")
+
+
+def check_formats(formats: list[str]) -> tuple[str, ...]:
+    unknown = set(formats) - set(OUTPUT_FORMATS)
+    if unknown:
+        raise typer.BadParameter(f"Unknown format(s) {', '.join(sorted(unknown))}, expected: {', '.join(OUTPUT_FORMATS)}")
+    return tuple(dict.fromkeys(formats))
+
+
+def open_journal(output_filename: Path, playlist_ids: list[str], resume: bool, restart: bool = False) -> ScrapeJournal:
+    """
+    Open the checkpoint journal kept next to the output file, at ``<output>.journal``.
+
+    An existing journal belongs to an interrupted run; it is only continued with
+    ``resume`` or discarded with ``restart``, never overwritten implicitly.
+    """
+    path = Path(output_filename).with_name(Path(output_filename).name + ".journal")
+    if resume and restart:
+        raise typer.BadParameter("--resume and --restart are mutually exclusive")
+    if resume and not path.exists():
+        raise typer.BadParameter(f"No checkpoint journal to resume from at {path}")
+    if not resume and not restart and path.exists():
+        raise typer.BadParameter(
+            f"An interrupted run left a checkpoint journal at {path}; "
+            "pass --resume to continue it or --restart to discard it"
+        )
+    try:
+        return ScrapeJournal(path, playlist_ids, resume)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+def run_scrape(
+    scraper_class: type[YouTubePlaylistScraper],
+    run_playlists: list[str],
+    default_name: str,
+    transport: str,
+    concurrency: int,
+    quota_rate: float,
+    max_retries: int,
+    incremental: bool,
+    cache_path: Path,
+    max_age: float,
+    delta: bool,
+    output: Path | None,
+    formats: list[str],
+    trace: Path | None,
+    resume: bool,
+    restart: bool,
+    **target,
+):
+    """
+    Validate the options shared by ``scrape`` and ``batch``, then build and run the scraper.
+
+    Args:
+        scraper_class: YouTubePlaylistScraper or PlaylistBatchScraper
+        run_playlists: Playlists of this run, as recorded in its checkpoint journal
+        default_name: Output file stem under data/ when --output is not given
+        **target: Playlist argument of ``scraper_class`` (``playlist_id`` or ``playlist_ids``)
+
+    The remaining arguments are the command-line options of the same names.
+    """
+    API_KEY = load_api_key()
+
+    if transport not in TRANSPORTS:
+        raise typer.BadParameter(f"Unknown transport '{transport}', expected one of: {', '.join(TRANSPORTS)}")
+    if delta and not incremental:
+        raise typer.BadParameter("--delta requires --incremental")
+    if resume and not output:
+        raise typer.BadParameter("--resume requires the --output of the run to continue")
+
+    formats = check_formats(formats)
+
     # Create data directory if it doesn't exist
     data_dir = Path("data")
     data_dir.mkdir(exist_ok=True)
-    
+
     # Generate timestamp for filename
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    output_filename = data_dir / f"youtube_playlist_{playlist_id}_{timestamp}.csv"
-    
-    # Create scraper instance
-    scraper = YouTubePlaylistScraper(
+    suffix = "_delta" if delta else ""
+    output_filename = output or data_dir / f"{default_name}_{timestamp}{suffix}.csv"
+
+    with ExitStack() as stack:
+        cache = stack.enter_context(closing(ResponseCache(cache_path))) if incremental else None
+        sink = stack.enter_context(closing(JsonLinesSink(trace))) if trace else None
+        scraper = scraper_class(
+            **target,
+            api_key=API_KEY,
+            output_filename=str(output_filename),
+            transport=transport,
+            scheduler=RequestScheduler(
+                max_concurrency=concurrency,
+                quota_per_second=quota_rate,
+                max_retries=max_retries,
+            ),
+            cache=cache,
+            max_age=timedelta(hours=max_age),
+            delta=delta,
+            formats=formats,
+            instrumentation=Instrumentation(sink) if sink else None,
+        )
+
+        # Opened last: a journal left by setup that failed would block the next run
+        scraper.journal = open_journal(output_filename, run_playlists, resume, restart)
+        stack.callback(scraper.journal.release)
+
+        # Run the scraper
+        asyncio.run(scraper.run())
+
+
+@app.command("scrape")
+def main(
+    playlist_id: str = typer.Argument(..., help="YouTube playlist ID to scrape"),
+    transport: str = TRANSPORT_OPTION,
+    concurrency: int = CONCURRENCY_OPTION,
+    quota_rate: float = QUOTA_RATE_OPTION,
+    max_retries: int = MAX_RETRIES_OPTION,
+    incremental: bool = INCREMENTAL_OPTION,
+    cache_path: Path = CACHE_PATH_OPTION,
+    max_age: float = MAX_AGE_OPTION,
+    delta: bool = DELTA_OPTION,
+    output: Path = OUTPUT_OPTION,
+    formats: list[str] = FORMAT_OPTION,
+    trace: Path = TRACE_OPTION,
+    resume: bool = RESUME_OPTION,
+    restart: bool = RESTART_OPTION,
+):
+    """Scrape a single playlist to CSV."""
+    run_scrape(
+        YouTubePlaylistScraper, [playlist_id], f"youtube_playlist_{playlist_id}",
+        transport, concurrency, quota_rate, max_retries, incremental, cache_path, max_age,
+        delta, output, formats, trace, resume, restart,
         playlist_id=playlist_id,
-        api_key=API_KEY,
-        output_filename=str(output_filename)
     )
-    
-    # Run the scraper
-    asyncio.run(scraper.run())
+
+
+@app.command("batch")
+def batch(
+    playlist_ids: list[str] = typer.Argument(None, help="YouTube playlist IDs to scrape"),
+    playlists_file: Path = typer.Option(None, "--file", "-f", exists=True, dir_okay=False, help="File with one playlist ID per line"),
+    transport: str = TRANSPORT_OPTION,
+    concurrency: int = CONCURRENCY_OPTION,
+    quota_rate: float = QUOTA_RATE_OPTION,
+    max_retries: int = MAX_RETRIES_OPTION,
+    incremental: bool = INCREMENTAL_OPTION,
+    cache_path: Path = CACHE_PATH_OPTION,
+    max_age: float = MAX_AGE_OPTION,
+    delta: bool = DELTA_OPTION,
+    output: Path = OUTPUT_OPTION,
+    formats: list[str] = FORMAT_OPTION,
+    trace: Path = TRACE_OPTION,
+    resume: bool = RESUME_OPTION,
+    restart: bool = RESTART_OPTION,
+):
+    """Scrape many playlists into one combined, de-duplicated dataset."""
+    ids = read_playlist_ids(playlist_ids, playlists_file)
+    if not ids:
+        raise typer.BadParameter("Pass playlist IDs as arguments or with --file")
+
+    run_scrape(
+        PlaylistBatchScraper, ids, "youtube_playlists_batch",
+        transport, concurrency, quota_rate, max_retries, incremental, cache_path, max_age,
+        delta, output, formats, trace, resume, restart,
+        playlist_ids=ids,
+    )
+
+
+def with_default_command(argv: list[str]) -> list[str]:
+    """
+    Route ``scraper.py PLAYLIST_ID [options]`` (the original single-playlist form) to ``scrape``.
+
+    Arguments already naming a command, and the app's own options such as
+    ``--help``, are left as they are.
+    """
+    commands = {command.name for command in app.registered_commands}
+    if len(argv) > 1 and argv[1] not in commands and argv[1] not in ("--help", "--install-completion", "--show-completion"):
+        return [argv[0], "scrape", *argv[1:]]
+    return argv
 
 
 if __name__ == "__main__":
-    typer.run(main)
\ No newline at end of file
+    sys.argv = with_default_command(sys.argv)
+    app()
@@ -0,0 +1,158 @@
+"""
+End-to-end checks against the local fake YouTube Data API (utils/fake_youtube_api.py).
+
+Run with ``uv run pytest``. No API key or network access is needed.
+"""
+
+import asyncio
+import csv
+
+import pytest
+import typer
+
+import ingest
+from fake_youtube_api import FakeYouTubeAPI
+from scraper import PlaylistBatchScraper, YouTubePlaylistScraper, open_journal
+
+QUOTA_EXCEEDED = {"code": 403, "message": "Quota exceeded.", "errors": [{"reason": "quotaExceeded"}]}
+
+
+class RecordingAPI(FakeYouTubeAPI):
+    """Fake API that logs every request and can fail playlist pages from an offset on."""
+
+    fail_from: int | None = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.log: list[tuple[str, dict]] = []
+
+    def respond(self, path, query, etag):
+        self.log.append((path.rsplit("/", 1)[-1], query))
+        if self.fail_from is not None and path.endswith("/playlistItems") and int(query.get("pageToken", ["0"])[0]) >= self.fail_from:
+            return 403, {"error": QUOTA_EXCEEDED}  # Not retryable: the run stops here
+        return super().respond(path, query, etag)
+
+    def requested_videos(self) -> list[str]:
+        return [video_id for endpoint, query in self.log if endpoint == "videos" for video_id in query["id"][0].split(",")]
+
+    def requested_page_tokens(self) -> list[str]:
+        return [query.get("pageToken", ["0"])[0] for endpoint, query in self.log if endpoint == "playlistItems"]
+
+
+class SharedVideosAPI(RecordingAPI):
+    """Every playlist holds the same videos by position, so playlists overlap."""
+
+    @staticmethod
+    def video_id(playlist_id, position):
+        return f"shared{position:05d}"
+
+
+@pytest.fixture
+def api():
+    with RecordingAPI() as api:
+        yield api
+
+
+def scrape(api, output, playlist_ids, resume=False):
+    """Run a scraper (single or batch) with a checkpoint journal, as the CLI does."""
+    journal = open_journal(output, playlist_ids, resume)
+    if len(playlist_ids) == 1:
+        scraper = YouTubePlaylistScraper(playlist_ids[0], "test", output_filename=str(output), base_url=api.url, journal=journal)
+    else:
+        scraper = PlaylistBatchScraper(playlist_ids, "test", output_filename=str(output), base_url=api.url, journal=journal)
+    try:
+        asyncio.run(scraper.run())
+    finally:
+        journal.release()
+    return scraper
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return sorted(map(tuple, csv.reader(f)))
+
+
+def test_resume_continues_where_the_run_stopped(api, tmp_path):
+    output = tmp_path / "resumed.csv"
+    journal = tmp_path / "resumed.csv.journal"
+
+    api.fail_from = 150
+    scrape(api, output, ["resume-230"])
+    assert journal.exists()
+    first_videos = api.requested_videos()
+
+    api.fail_from = None
+    api.log.clear()
+    scrape(api, output, ["resume-230"], resume=True)
+    assert not journal.exists()
+
+    # Paging picks up at the failed page, and no video's stats are fetched twice
+    assert api.requested_page_tokens() == ["150", "200"]
+    resumed_videos = api.requested_videos()
+    assert not set(first_videos) & set(resumed_videos)
+    assert len(set(first_videos) | set(resumed_videos)) == 230
+
+    clean = tmp_path / "clean.csv"
+    scrape(api, clean, ["resume-230"])
+    assert read_rows(output) == read_rows(clean)
+
+
+def test_existing_journal_is_not_overwritten(api, tmp_path):
+    output = tmp_path / "out.csv"
+    api.fail_from = 50
+    scrape(api, output, ["stop-120"])
+
+    with pytest.raises(typer.BadParameter, match="--resume"):
+        open_journal(output, ["stop-120"], resume=False)
+    assert (tmp_path / "out.csv.journal").exists()
+
+
+def test_batch_fetches_each_video_once(tmp_path):
+    with SharedVideosAPI() as api:
+        output = tmp_path / "batch.csv"
+        scrape(api, output, ["a-120", "b-80", "c-200"])
+        requested = api.requested_videos()
+
+    assert len(requested) == len(set(requested)) == 200
+    assert len(read_rows(output)) == 200 + 1  # Header
+    assert len(read_rows(tmp_path / "batch_memberships.csv")) == 120 + 80 + 200 + 1
+
+
+@pytest.mark.parametrize("clean", [True, False])
+def test_reingest_keeps_is_indexed_and_cleaned_text(api, tmp_path, clean):
+    output = tmp_path / "videos.csv"
+    scrape(api, output, ["ingest-150"])
+    conn = ingest.connect(tmp_path / "videos.db")
+
+    ingest.ingest_file(conn, output, clean=True)
+    with conn:
+        conn.execute("UPDATE videos SET is_indexed = 1")
+    ingest.ingest_file(conn, output, clean=clean)
+
+    counts = conn.execute(
+        "SELECT COUNT(*), SUM(is_indexed), COUNT(description_cleaned), SUM(description_cleaned != '') FROM videos"
+    ).fetchone()
+    conn.close()
+    assert counts == (150, 150, 150, 150)
+
+
+def test_delta_removed_rows_leave_stored_videos_alone(api, tmp_path):
+    output = tmp_path / "videos.csv"
+    scrape(api, output, ["delta-60"])
+    conn = ingest.connect(tmp_path / "videos.db")
+    ingest.ingest_file(conn, output)
+
+    with open(output, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        header, video_ids = reader.fieldnames, [record["video_id"] for record in reader]
+    delta = tmp_path / "delta.csv"
+    with open(delta, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, [*header, "change"])
+        writer.writeheader()
+        writer.writerows({"video_id": video_id, "change": "removed"} for video_id in video_ids[:10])
+
+    for clean in (True, False):
+        assert ingest.ingest_file(conn, delta, clean=clean) == 0
+    blank = conn.execute("SELECT COUNT(*) FROM videos WHERE title = '' OR title IS NULL OR views IS NULL").fetchone()[0]
+    conn.close()
+    assert blank == 0
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark YouTubePlaylistScraper end to end against the local fake API.
+
+Each scenario serves a synthetic playlist from fake_youtube_api.py and scrapes
+it in a fresh process (so peak RSS belongs to that run alone). Results come
+from the scraper's instrumentation events rather than its printed progress:
+
+- pagination: wall time of the playlist paging stage
+- stats: first ``videos`` batch sent to last batch done (overlaps pagination)
+- export: time spent in writers, including the final flush and rename
+- requests/s, p50/p95 request latency, retries, bytes received, peak RSS
+
+No API key or network access is needed. Use ``--json`` to keep results for
+regression comparisons.
+"""
+
+import asyncio
+import io
+import json
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, redirect_stdout
+from multiprocessing import get_context
+from pathlib import Path
+
+import typer
+
+from fake_youtube_api import FakeYouTubeAPI
+from scraper import Instrumentation, RequestScheduler, YouTubePlaylistScraper
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports KiB
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def window(events: list[dict]) -> float:
+    """Wall time from the first span's start to the last span's end."""
+    if not events:
+        return 0.0
+    return max(event["start"] + event["seconds"] for event in events) - min(event["start"] for event in events)
+
+
+def summarize(events: list[dict]) -> dict:
+    """
+    Reduce instrumentation events to per-stage timings.
+
+    Args:
+        events (list[dict]): Events emitted by the scraper's Instrumentation hook
+
+    Returns:
+        dict: Stage wall times and request latency percentiles, in seconds
+    """
+    by_name: dict[str, list[dict]] = {}
+    for event in events:
+        by_name.setdefault(event["event"], []).append(event)
+    stages = {event["stage"]: event["seconds"] for event in by_name.get("stage", [])}
+    latencies = [event["seconds"] for event in by_name.get("request", [])]
+
+    return {
+        "pagination_seconds": stages.get("pagination", 0.0),
+        "stats_seconds": window(by_name.get("batch", [])),
+        "export_seconds": sum(event["seconds"] for event in by_name.get("write", [])) + stages.get("finalize", 0.0),
+        "request_p50_ms": percentile(latencies, 0.5) * 1000,
+        "request_p95_ms": percentile(latencies, 0.95) * 1000,
+        "pages": len(by_name.get("page", [])),
+        "batches": len(by_name.get("batch", [])),
+    }
+
+
+async def scrape(scraper: YouTubePlaylistScraper) -> int:
+    """Stream the playlist into the scraper's writers, timing the final close as its own stage."""
+    with ExitStack() as stack:
+        writers = scraper.open_writers(stack)
+        await scraper.export(writers)
+        with scraper.instrumentation.span("stage", stage="finalize"):
+            stack.close()
+    return writers[0].rows
+
+
+def run_scenario(base_url: str, playlist_id: str, concurrency: int, quota_rate: float, formats: tuple[str, ...], events_path: str | None) -> dict:
+    """
+    Scrape one synthetic playlist and measure it (runs in a child process).
+
+    Args:
+        base_url (str): Fake API root
+        playlist_id (str): Synthetic playlist, sized by its ``-<count>`` suffix
+        concurrency (int): Scheduler max_concurrency
+        quota_rate (float): Scheduler quota units per second
+        formats (tuple[str, ...]): Output formats to write
+        events_path (str, optional): Also write the raw events here as JSON lines
+
+    Returns:
+        dict: Measurements for this run
+    """
+    events: list[dict] = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        scraper = YouTubePlaylistScraper(
+            playlist_id=playlist_id,
+            api_key="benchmark",
+            output_filename=str(Path(output_dir) / "benchmark.csv"),
+            scheduler=RequestScheduler(max_concurrency=concurrency, quota_per_second=quota_rate),
+            formats=formats,
+            base_url=base_url,
+            instrumentation=Instrumentation(events.append),
+        )
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):  # Progress lines are not part of the measurement
+            rows = asyncio.run(scrape(scraper))
+        elapsed = time.perf_counter() - started
+
+    if events_path:
+        with open(events_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(event) + "\n" for event in events)
+
+    stats = scraper.scheduler.stats
+    return {
+        "rows": rows,
+        "wall_seconds": elapsed,
+        "requests": stats.requests,
+        "requests_per_second": stats.requests / elapsed if elapsed else 0.0,
+        "retries": stats.retries,
+        "failures": stats.failures,
+        "bytes_received": scraper.transport.bytes_received,
+        "peak_rss_mb": peak_rss_bytes() / 2**20,
+        **summarize(events),
+    }
+
+
+def print_result(result: dict):
+    print(
+        f"  ✓ {result['videos']:>7} videos × c{result['concurrency']:<3} "
+        f"{result['wall_seconds']:7.2f}s total | "
+        f"pages {result['pagination_seconds']:6.2f}s  stats {result['stats_seconds']:6.2f}s  export {result['export_seconds']:5.2f}s | "
+        f"{result['requests_per_second']:7.1f} req/s  p50 {result['request_p50_ms']:5.1f}ms  p95 {result['request_p95_ms']:5.1f}ms | "
+        f"{result['bytes_received'] / 1e6:6.1f} MB  RSS {result['peak_rss_mb']:6.1f} MB"
+        + (f" | {result['retries']} retries" if result["retries"] else "")
+    )
+
+
+app = typer.Typer(help="Benchmark the scraper against a local fake YouTube Data API")
+
+
+@app.command()
+def run(
+    videos: list[int] = typer.Option([1000, 10000], "--videos", help="Playlist sizes to benchmark (repeatable)"),
+    concurrency: list[int] = typer.Option([8], "--concurrency", help="Scheduler concurrency levels (repeatable)"),
+    latency: float = typer.Option(0.05, help="Fake API latency per response, seconds"),
+    jitter: float = typer.Option(0.02, help="Extra random latency per response, up to this many seconds"),
+    error_rate: float = typer.Option(0.0, help="Fraction of requests answered with an injected error"),
+    error_code: int = typer.Option(403, help="Injected error status: 403 (rate limit), 500 or 503"),
+    quota_rate: float = typer.Option(10_000.0, help="Quota units per second; high by default so the limiter is not what is measured"),
+    formats: list[str] = typer.Option(["csv"], "--format", help="Output format, 'csv' and/or 'parquet' (repeatable)"),
+    repeat: int = typer.Option(1, help="Runs per scenario"),
+    json_path: Path = typer.Option(None, "--json", help="Write all results to this JSON file"),
+    events_dir: Path = typer.Option(None, "--events", help="Write each run's raw instrumentation events (JSON lines) into this directory"),
+):
+    """Run every (size, concurrency) scenario and report per-stage timings."""
+    if events_dir:
+        events_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"🏁 Benchmarking against the fake API (latency {latency * 1000:.0f}±{jitter * 1000:.0f} ms, error rate {error_rate:.0%})")
+    results = []
+    with FakeYouTubeAPI(latency=latency, jitter=jitter, error_rate=error_rate, error_code=error_code, seed=0) as api:
+        for size in videos:
+            for level in concurrency:
+                for attempt in range(repeat):
+                    events_path = events_dir / f"events_{size}_c{level}_{attempt}.jsonl" if events_dir else None
+                    # A fresh process per run keeps peak RSS and interpreter state independent
+                    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                        result = pool.submit(
+                            run_scenario, api.url, f"bench-{size}", level, quota_rate,
+                            tuple(dict.fromkeys(formats)), str(events_path) if events_path else None,
+                        ).result()
+                    result = {"videos": size, "concurrency": level, "run": attempt, **result}
+                    print_result(result)
+                    results.append(result)
+
+    if json_path:
+        json_path.write_text(json.dumps(results, indent=2))
+        print(f"✅ Results saved to: {json_path}")
+
+
+if __name__ == "__main__":
+    app()
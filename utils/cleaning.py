@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Vectorized cleaning and normalization of scraped video data.
+
+Every step works on whole pandas columns (``.str`` regex methods, batch
+datetime parsing, hashed de-duplication) rather than looping over rows in
+Python, so cleaning stays fast past 100k videos. ``clean_dataframe`` runs the
+Phase 0.1 and 0.2 steps from the cleaning plan and reports per-step timings
+and row counts.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from scraper import ISO_DURATION
+
+# Same grammar as scraper.parse_duration, so CSV and Parquet exports agree
+DURATION_PATTERN = rf"^(?:{ISO_DURATION.pattern})$"
+DURATION_UNITS = np.array([604800, 86400, 3600, 60, 1])
+
+URL_PATTERN = r"(?:https?://|www\.)\S+|\b(?:bit\.ly|youtu\.be|t\.co|goo\.gl|amzn\.to)/\S+"
+TIMESTAMP_PATTERN = r"\[?\(?\b(?:\d{1,2}:)?\d{1,2}:\d{2}\b\)?\]?"
+PLATFORMS = r"(?:twitter|x|linkedin|instagram|tiktok|facebook|patreon|discord|threads|mastodon|github)"
+# Social/newsletter/sponsor calls to action, removed up to the end of their clause
+# (at most 80 characters). Descriptions reach cleaning flattened onto one line
+# from the CSV, so nothing here may rely on line boundaries. A bare platform name
+# ("Patreon supporters rock") is content, not boilerplate.
+BOILERPLATE_PATTERN = (
+    r"(?i)\b(?:"
+    rf"follow (?:me|us) (?:on {PLATFORMS}|for more)|connect with (?:me|us) on {PLATFORMS}|where to find (?:me|us)|"
+    rf"support (?:me|us|the channel|this channel) on {PLATFORMS}|"
+    rf"subscribe to (?:my|our|the) (?:channel|newsletter)|join (?:my|our|the) (?:mailing list|newsletter|community|{PLATFORMS})|"
+    r"(?:this video is )?sponsored by|use (?:my |the )?(?:promo|discount|coupon) code|use my (?:affiliate )?link|affiliate links?"
+    r")\b[^.!?:|•\n]{0,80}[.!?:|•]?"
+)
+RESOURCE_HEADER_PATTERN = r"(?im)^\s*(?:resources|links|socials?|useful links)\s*:?\s*$"
+# Patterns stay within the common subset of Python re and RE2 (pyarrow-backed strings)
+REPEATED_PUNCTUATION = {r"!{2,}": "!", r"\?{2,}": "?"}
+# Arrow-backed strings run every .str method in Arrow compute (RE2 for regexes);
+# pandas' "string" dtype is still Python-backed on pandas 2.x and loops per element
+STRING_DTYPE = pd.ArrowDtype(pa.string())
+
+
+def remove_duplicates(df, subset="video_id"):
+    """
+    Remove duplicate rows by key, keeping the first occurrence.
+
+    Keys are hashed to uint64 in one vectorized pass, so duplicate detection
+    compares integers rather than strings.
+
+    Args:
+        df (pd.DataFrame): Scraped videos
+        subset (str | list[str]): Column(s) identifying a video
+
+    Returns:
+        pd.DataFrame: DataFrame without duplicate keys
+    """
+    hashes = pd.util.hash_pandas_object(df[subset], index=False)
+    return df[~hashes.duplicated().to_numpy()]
+
+
+def remove_missing_descriptions(df, column="video_description"):
+    """
+    Drop rows whose description is null, empty or whitespace only.
+
+    Args:
+        df (pd.DataFrame): Scraped videos
+        column (str): Description column
+
+    Returns:
+        pd.DataFrame: DataFrame with a description on every row
+    """
+    descriptions = df[column].astype(STRING_DTYPE).str.strip()
+    return df[descriptions.fillna("").str.len().to_numpy() > 0]
+
+
+def trim_whitespace(df):
+    """
+    Strip leading/trailing whitespace from every text column.
+
+    Text columns come back as Arrow-backed strings, which the later steps expect.
+
+    Args:
+        df (pd.DataFrame): Scraped videos
+
+    Returns:
+        pd.DataFrame: Copy with trimmed text columns
+    """
+    df = df.copy()
+    for column, dtype in df.dtypes.items():
+        if dtype == object or isinstance(dtype, pd.StringDtype) or dtype == STRING_DTYPE:
+            df[column] = df[column].astype(STRING_DTYPE).str.strip()
+    return df
+
+
+def parse_duration(durations):
+    """
+    Convert ISO 8601 durations ("PT1H46M33S") to integer seconds.
+
+    Args:
+        durations (pd.Series): ISO 8601 duration strings
+
+    Returns:
+        pd.Series: Nullable Int64 seconds; <NA> where the value does not parse
+    """
+    durations = durations.astype(STRING_DTYPE)
+    parts = durations.str.extract(DURATION_PATTERN)
+    parts = parts.where(parts.ne("")).astype("float64")  # Arrow leaves unmatched groups empty, not null
+    # "P", "PT" and a dangling "T" match the pattern but name no duration
+    matched = (
+        durations.str.match(DURATION_PATTERN).fillna(False).to_numpy(dtype=bool)
+        & ~durations.str.endswith("T").fillna(False).to_numpy(dtype=bool)
+        & parts.notna().any(axis=1).to_numpy()
+    )
+    seconds = parts.fillna(0).to_numpy() @ DURATION_UNITS
+    return pd.Series(seconds, index=durations.index).astype("Int64").where(matched, pd.NA)
+
+
+def parse_datetime(datetimes):
+    """
+    Parse ISO 8601 timestamps in one batch.
+
+    Args:
+        datetimes (pd.Series): ISO 8601 timestamp strings
+
+    Returns:
+        pd.Series: UTC datetimes; NaT where the value does not parse
+    """
+    return pd.to_datetime(datetimes, utc=True, format="ISO8601", errors="coerce")
+
+
+def clean_descriptions(descriptions):
+    """
+    Strip URLs, timestamps and social/newsletter/sponsor calls to action from descriptions.
+
+    URLs go first, so a call to action ends at the colon that introduced its link.
+    A description flattened onto one line by the CSV writer keeps its substance:
+
+    >>> clean_descriptions(pd.Series([
+    ...     "Intro to transformers. Follow me on Twitter: https://twitter.com/x "
+    ...     "Patreon supporters rock. Join our Discord: https://discord.gg/x 00:00 Attention explained"
+    ... ])).tolist()
+    ['Intro to transformers. Patreon supporters rock. Attention explained']
+
+    Args:
+        descriptions (pd.Series): Raw descriptions
+
+    Returns:
+        pd.Series: Cleaned descriptions with whitespace collapsed
+    """
+    return (
+        descriptions.astype(STRING_DTYPE)
+        .str.replace(URL_PATTERN, "", regex=True)
+        .str.replace(BOILERPLATE_PATTERN, "", regex=True)
+        .str.replace(RESOURCE_HEADER_PATTERN, "", regex=True)
+        .str.replace(TIMESTAMP_PATTERN, "", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def clean_titles(titles):
+    """
+    Collapse repeated punctuation ("!!!" -> "!") and whitespace in titles.
+
+    Args:
+        titles (pd.Series): Raw titles
+
+    Returns:
+        pd.Series: Cleaned titles
+    """
+    titles = titles.astype(STRING_DTYPE)
+    for pattern, replacement in REPEATED_PUNCTUATION.items():
+        titles = titles.str.replace(pattern, replacement, regex=True)
+    return titles.str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def _with_parsed_columns(df):
+    df = df.copy()
+    if "video_length" in df.columns:
+        df["duration_seconds"] = parse_duration(df["video_length"])
+    if "video_published_datetime" in df.columns:
+        df["video_published_datetime"] = parse_datetime(df["video_published_datetime"])
+    return df
+
+
+def _with_cleaned_text(df):
+    df = df.copy()
+    df["title_cleaned"] = clean_titles(df["title"])
+    df["description_cleaned"] = clean_descriptions(df["video_description"])
+    return df
+
+
+CLEANING_STEPS = [
+    ("remove_duplicates", remove_duplicates),
+    ("remove_missing_descriptions", remove_missing_descriptions),
+    ("trim_whitespace", trim_whitespace),
+    ("parse_columns", _with_parsed_columns),
+    ("clean_text", _with_cleaned_text),
+]
+
+
+def clean_dataframe(df, verbose=True):
+    """
+    Run every cleaning step, timing each one and counting rows in and out.
+
+    Raw ``title`` and ``video_description`` are kept; ``title_cleaned``,
+    ``description_cleaned`` and ``duration_seconds`` are added and
+    ``video_published_datetime`` becomes a UTC datetime column.
+
+    Args:
+        df (pd.DataFrame): Scraped videos (CSV or Parquet columns)
+        verbose (bool): Print one line per step
+
+    Returns:
+        tuple[pd.DataFrame, list[dict]]: Cleaned DataFrame and per-step report
+            entries with ``step``, ``rows_in``, ``rows_out`` and ``seconds``
+    """
+    report = []
+    for name, step in CLEANING_STEPS:
+        rows_in = len(df)
+        started = time.perf_counter()
+        df = step(df)
+        entry = {"step": name, "rows_in": rows_in, "rows_out": len(df), "seconds": time.perf_counter() - started}
+        report.append(entry)
+        if verbose:
+            removed = f", removed {rows_in - len(df)}" if rows_in != len(df) else ""
+            print(f"  🧹 {name}: {len(df)} rows{removed} ({entry['seconds'] * 1000:.1f} ms)")
+    return df, report
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the YouTube Data API, for benchmarks and offline runs.
+
+Serves the two endpoints the scraper calls, ``playlistItems`` and ``videos``,
+from synthetic playlists of any size: ``nextPageToken`` pagination of up to
+50 items, at most 50 IDs per ``videos`` call, ETags with 304 Not Modified,
+and gzip bodies. Latency and error injection (rate limiting or server errors
+on a fraction of requests) are configurable.
+
+Any playlist ID is valid. Its size is ``playlist_size``, unless the ID ends
+in ``-<count>`` (``bench-20000`` has 20,000 videos). Video IDs are derived
+from the playlist ID, so repeated runs return identical data.
+"""
+
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import typer
+
+SIZE_SUFFIX = re.compile(r"-(\d+)$")
+MAX_RESULTS = 50
+
+DESCRIPTION = (
+    "In this video we walk through the topic step by step, with worked examples and common pitfalls.\n\n"
+    "⏱️ Timestamps\n00:00 Intro\n02:15 Setup\n10:42 Deep dive\n25:03 Wrap-up\n\n"
+    "🔗 Resources: https://example.com/resources\n"
+    "Follow me on Twitter: https://twitter.com/example\n"
+    "Subscribe to the newsletter for weekly updates: https://example.com/newsletter\n"
+) * 3
+
+ERRORS = {
+    403: {"code": 403, "message": "The request cannot be completed because you have exceeded your quota.", "errors": [{"reason": "rateLimitExceeded"}]},
+    500: {"code": 500, "message": "Backend Error", "errors": [{"reason": "backendError"}]},
+    503: {"code": 503, "message": "The service is currently unavailable.", "errors": [{"reason": "backendError"}]},
+}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # The default of 5 drops connection bursts from a concurrent client
+
+
+class FakeYouTubeAPI:
+    """
+    Synthetic YouTube Data API served over HTTP from a background thread.
+
+    Usage::
+
+        with FakeYouTubeAPI(playlist_size=5000, latency=0.05) as api:
+            scraper = YouTubePlaylistScraper("bench", "key", base_url=api.url)
+    """
+
+    def __init__(
+        self,
+        playlist_size: int = 1000,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_code: int = 403,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int | None = None,
+    ):
+        """
+        Args:
+            playlist_size: Videos in a playlist whose ID has no ``-<count>`` suffix
+            latency: Seconds added to every response
+            jitter: Extra latency drawn uniformly from [0, jitter] seconds
+            error_rate: Fraction of requests answered with an error payload
+            error_code: Status of injected errors: 403 (rateLimitExceeded), 500 or 503
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            seed: Seed for latency jitter and error injection
+        """
+        self.playlist_size = playlist_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error = ERRORS[error_code]
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to the scraper as ``base_url``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/youtube/v3"
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted, then close the socket."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self):
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def playlist_length(self, playlist_id: str) -> int:
+        match = SIZE_SUFFIX.search(playlist_id)
+        return int(match.group(1)) if match else self.playlist_size
+
+    @staticmethod
+    def video_id(playlist_id: str, position: int) -> str:
+        """11-character video ID, unique per (playlist, position)."""
+        return f"{zlib.crc32(playlist_id.encode()):08x}"[:5] + f"{position:06d}"
+
+    def playlist_items(self, query: dict) -> tuple[int, dict]:
+        playlist_id = query.get("playlistId", [""])[0]
+        if not playlist_id:
+            return 400, {"error": {"code": 400, "message": "No filter selected.", "errors": [{"reason": "missingRequiredParameter"}]}}
+        max_results = min(int(query.get("maxResults", ["5"])[0]), MAX_RESULTS)
+        # Page tokens are opaque to clients; here they encode the next offset
+        start = int(query.get("pageToken", ["0"])[0])
+        total = self.playlist_length(playlist_id)
+        end = min(start + max_results, total)
+
+        body = {
+            "kind": "youtube#playlistItemListResponse",
+            "items": [
+                {
+                    "kind": "youtube#playlistItem",
+                    "snippet": {
+                        "playlistId": playlist_id,
+                        "position": position,
+                        "channelTitle": "Benchmark Playlists",
+                        "videoOwnerChannelTitle": f"Channel {position % 97}",
+                    },
+                    "contentDetails": {"videoId": self.video_id(playlist_id, position)},
+                }
+                for position in range(start, end)
+            ],
+            "pageInfo": {"totalResults": total, "resultsPerPage": max_results},
+        }
+        if end < total:
+            body["nextPageToken"] = str(end)
+        return 200, body
+
+    @staticmethod
+    def video(video_id: str) -> dict:
+        """Deterministic ``videos`` resource for any ID."""
+        h = zlib.crc32(video_id.encode())
+        return {
+            "kind": "youtube#video",
+            "id": video_id,
+            "snippet": {
+                "title": f"Synthetic video {video_id} — a tutorial!!",
+                "description": DESCRIPTION,
+                "publishedAt": f"2024-{h % 12 + 1:02d}-{h % 28 + 1:02d}T12:00:00Z",
+            },
+            "statistics": {
+                "viewCount": str(h % 1_000_000),
+                "likeCount": str(h % 50_000),
+                "commentCount": str(h % 2_000),
+            },
+            "contentDetails": {"duration": f"PT{h % 3}H{h % 60}M{h % 59 + 1}S"},
+        }
+
+    def videos(self, query: dict) -> tuple[int, dict]:
+        ids = [video_id for video_id in query.get("id", [""])[0].split(",") if video_id]
+        if len(ids) > MAX_RESULTS:
+            return 400, {"error": {"code": 400, "message": "The request specifies an invalid filter parameter.", "errors": [{"reason": "invalidFilters"}]}}
+
+        body = {
+            "kind": "youtube#videoListResponse",
+            "items": [self.video(video_id) for video_id in ids],
+            "pageInfo": {"totalResults": len(ids), "resultsPerPage": len(ids)},
+        }
+        return 200, body
+
+    def respond(self, path: str, query: dict, etag: str | None) -> tuple[int, dict | None]:
+        """Status and JSON body for a request (None for 304 Not Modified)."""
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.errors += 1
+                return self.error["code"], {"error": self.error}
+
+        if path.endswith("/playlistItems"):
+            status, body = self.playlist_items(query)
+        elif path.endswith("/videos"):
+            status, body = self.videos(query)
+        else:
+            return 404, {"error": {"code": 404, "message": "Not Found", "errors": [{"reason": "notFound"}]}}
+
+        if status == 200:
+            body["etag"] = hashlib.md5(json.dumps(body, sort_keys=True).encode()).hexdigest()
+            if etag == body["etag"]:
+                return 304, None
+        return status, body
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+            disable_nagle_algorithm = True  # Headers and body are separate writes; avoid delayed-ACK stalls
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                status, body = api.respond(url.path, parse_qs(url.query), self.headers.get("If-None-Match"))
+                payload = json.dumps(body).encode() if body is not None else b""
+
+                self.send_response(status)
+                if body is not None:
+                    self.send_header("Content-Type", "application/json; charset=UTF-8")
+                    if "gzip" in self.headers.get("Accept-Encoding", ""):
+                        payload = gzip.compress(payload, compresslevel=1)
+                        self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with api._lock:
+                    api.bytes_sent += len(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+app = typer.Typer(help="Local fake YouTube Data API")
+
+
+@app.command()
+def serve(
+    port: int = typer.Option(8765, help="Port to listen on"),
+    playlist_size: int = typer.Option(1000, help="Videos per playlist (IDs ending in -<count> override it)"),
+    latency: float = typer.Option(0.0, help="Seconds added to every response"),
+    jitter: float = typer.Option(0.0, help="Extra random latency, up to this many seconds"),
+    error_rate: float = typer.Option(0.0, help="Fraction of requests answered with an error"),
+    error_code: int = typer.Option(403, help="Injected error status: 403, 500 or 503"),
+):
+    """Serve the fake API until interrupted."""
+    api = FakeYouTubeAPI(playlist_size, latency, jitter, error_rate, error_code, port=port)
+    print(f"🎭 Fake YouTube Data API at {api.url}")
+    try:
+        api.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"✅ Served {api.requests} requests ({api.errors} injected errors, {api.bytes_sent / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    app()
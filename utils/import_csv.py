@@ -4,6 +4,7 @@ Script to import CSV data into a pandas DataFrame and demonstrate basic operatio
 """
 
 import pandas as pd
+import pyarrow.parquet as pq
 import os
 
 def import_csv_to_dataframe(csv_path):
@@ -30,6 +31,52 @@ def import_csv_to_dataframe(csv_path):
         print(f"❌ Error importing CSV: {e}")
         return None
 
+def import_parquet_to_dataframe(parquet_path, columns=None):
+    """
+    Import a Parquet file written by the scraper into a pandas DataFrame.
+
+    Column types come from the file's fixed schema, so nothing is re-inferred.
+    The file is memory-mapped and only the requested columns are decoded.
+
+    Args:
+        parquet_path (str): Path to the Parquet file
+        columns (list[str], optional): Columns to load; all columns if None
+
+    Returns:
+        pd.DataFrame: DataFrame containing the Parquet data
+    """
+    try:
+        table = pq.read_table(parquet_path, columns=columns, memory_map=True)
+        df = table.to_pandas()
+        print(f"✅ Successfully imported Parquet file: {parquet_path}")
+        print(f"📊 DataFrame shape: {df.shape}")
+        print(f"📋 Columns: {list(df.columns)}")
+        return df
+    except FileNotFoundError:
+        print(f"❌ Error: File not found at {parquet_path}")
+        return None
+    except Exception as e:
+        print(f"❌ Error importing Parquet: {e}")
+        return None
+
+def import_dataset(path, columns=None):
+    """
+    Import a scraper dataset, picking the loader from the file extension.
+
+    Args:
+        path (str): Path to a .parquet or .csv file
+        columns (list[str], optional): Columns to load; all columns if None
+
+    Returns:
+        pd.DataFrame: DataFrame containing the dataset
+    """
+    if str(path).endswith(".parquet"):
+        return import_parquet_to_dataframe(path, columns)
+    df = import_csv_to_dataframe(path)
+    if df is not None and columns is not None:
+        df = df[columns]
+    return df
+
 def analyze_dataframe(df):
     """
     Perform basic analysis on the DataFrame.
@@ -60,13 +107,18 @@ def main():
     # Path to the CSV file
     csv_path = "data/youtube_playlist_20251219_083407.csv"
     
+    # Prefer the typed Parquet copy when the scraper wrote one
+    parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+    if os.path.exists(parquet_path):
+        csv_path = parquet_path
+    
     # Check if file exists
     if not os.path.exists(csv_path):
         print(f"❌ CSV file not found at: {csv_path}")
         return
     
-    # Import CSV to DataFrame
-    df = import_csv_to_dataframe(csv_path)
+    # Import dataset to DataFrame
+    df = import_dataset(csv_path)
     
     # Analyze the DataFrame
     analyze_dataframe(df)
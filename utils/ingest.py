@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Bulk-load scraper output into the SQLite videos database (data/videos.db).
+
+Rows come either from a dataset file (CSV or Parquet) or straight from
+YouTubePlaylistScraper's record stream. Each chunk goes through the vectorized
+cleaning steps in cleaning.py, then is upserted in large batched transactions;
+re-ingesting never resets ``is_indexed`` or ``created_at``.
+"""
+
+import asyncio
+import csv
+import sqlite3
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+import typer
+
+from cleaning import clean_dataframe
+from scraper import RequestScheduler, YouTubePlaylistScraper, load_api_key, parse_duration
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    channel_name TEXT,
+    title TEXT,
+    title_cleaned TEXT,
+    description TEXT,
+    description_cleaned TEXT,
+    duration_seconds INTEGER,
+    upload_date TEXT,
+    views INTEGER,
+    likes INTEGER,
+    comments INTEGER,
+    is_indexed INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_videos_is_indexed ON videos (is_indexed);
+CREATE INDEX IF NOT EXISTS idx_videos_upload_date ON videos (upload_date);
+"""
+
+COLUMNS = [
+    "video_id", "channel_name", "title", "title_cleaned", "description", "description_cleaned",
+    "duration_seconds", "upload_date", "views", "likes", "comments",
+]
+
+# Filled only by the cleaning step; a --no-clean ingest must not erase them
+CLEANED_COLUMNS = ("title_cleaned", "description_cleaned")
+
+
+def _update(column):
+    if column in CLEANED_COLUMNS:
+        return f"{column} = COALESCE(excluded.{column}, videos.{column})"
+    return f"{column} = excluded.{column}"
+
+
+# is_indexed and created_at are deliberately absent from the UPDATE clause
+UPSERT_SQL = f"""
+INSERT INTO videos ({", ".join(COLUMNS)})
+VALUES ({", ".join("?" * len(COLUMNS))})
+ON CONFLICT(video_id) DO UPDATE SET
+    {", ".join(_update(column) for column in COLUMNS[1:])}
+"""
+
+BATCH_SIZE = 10_000
+# Delta exports (scraper --delta) carry a change column; "removed" rows hold only
+# video_id and mean "left the playlist", so they must not overwrite stored videos
+REMOVED = "removed"
+
+
+def connect(db_path="data/videos.db"):
+    """
+    Open the videos database in WAL mode, creating the schema if needed.
+
+    Args:
+        db_path (str): Path to the SQLite database file
+
+    Returns:
+        sqlite3.Connection: Open connection
+    """
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL; skips an fsync per commit
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _to_int(value):
+    return int(value) if value not in (None, "") else None
+
+
+def _upload_date(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return value or None
+
+
+def to_row(record):
+    """
+    Map a dataset record to a ``videos`` row tuple (in ``COLUMNS`` order).
+
+    Accepts both the raw scraper/CSV record (string counts, ISO 8601
+    ``video_length``) and the typed Parquet record (``duration_seconds``).
+    """
+    duration = record.get("duration_seconds")
+    if duration is None:
+        duration = parse_duration(record.get("video_length", ""))
+    return (
+        record["video_id"],
+        record.get("channel_name"),
+        record.get("title"),
+        record.get("title_cleaned"),
+        record.get("video_description"),
+        record.get("description_cleaned"),
+        duration,
+        _upload_date(record.get("video_published_datetime")),
+        _to_int(record.get("video_views")),
+        _to_int(record.get("video_likes")),
+        _to_int(record.get("number_comments")),
+    )
+
+
+def iter_file_records(path):
+    """
+    Stream records from a CSV or Parquet dataset without loading it whole.
+
+    Rows a delta export marks ``removed`` are skipped.
+
+    Args:
+        path (str): Path to a .csv or .parquet file written by the scraper
+    """
+    if str(path).endswith(".parquet"):
+        records = (record for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_SIZE) for record in batch.to_pylist())
+        yield from (record for record in records if record.get("change") != REMOVED)
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from (record for record in csv.DictReader(f) if record.get("change") != REMOVED)
+
+
+def iter_file_frames(path):
+    """
+    Stream a CSV or Parquet dataset as DataFrame chunks of ``BATCH_SIZE`` rows.
+
+    Rows a delta export marks ``removed`` are dropped.
+
+    Args:
+        path (str): Path to a .csv or .parquet file written by the scraper
+    """
+    if str(path).endswith(".parquet"):
+        frames = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_SIZE))
+    else:
+        frames = pd.read_csv(path, chunksize=BATCH_SIZE, dtype={"video_id": str})
+    for df in frames:
+        yield df[df["change"].ne(REMOVED).to_numpy()] if "change" in df.columns else df
+
+
+def frame_to_rows(df):
+    """Map a cleaned DataFrame to ``videos`` row tuples (in ``COLUMNS`` order)."""
+    frame = pd.DataFrame({
+        "video_id": df["video_id"],
+        "channel_name": df["channel_name"],
+        "title": df["title"],
+        "title_cleaned": df["title_cleaned"],
+        "description": df["video_description"],
+        "description_cleaned": df["description_cleaned"],
+        "duration_seconds": df["duration_seconds"].astype("Int64"),
+        "upload_date": df["video_published_datetime"].dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "views": pd.to_numeric(df["video_views"], errors="coerce").astype("Int64"),
+        "likes": pd.to_numeric(df["video_likes"], errors="coerce").astype("Int64"),
+        "comments": pd.to_numeric(df["number_comments"], errors="coerce").astype("Int64"),
+    })
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.itertuples(index=False, name=None)
+
+
+def add_report(totals, report):
+    """Accumulate one chunk's cleaning report into per-step totals."""
+    for entry in report:
+        step = totals.setdefault(entry["step"], {"rows_in": 0, "rows_out": 0, "seconds": 0.0})
+        for key in step:
+            step[key] += entry[key]
+
+
+def ingest_frame(conn, df, totals=None):
+    """
+    Clean one DataFrame chunk and upsert it; the caller commits.
+
+    Args:
+        conn (sqlite3.Connection): Connection from ``connect``
+        df (pd.DataFrame): Chunk of dataset records
+        totals (dict, optional): Per-step cleaning totals to accumulate into
+
+    Returns:
+        int: Number of rows upserted
+    """
+    df, report = clean_dataframe(df, verbose=False)
+    if totals is not None:
+        add_report(totals, report)
+    return upsert_rows(conn, frame_to_rows(df))
+
+
+def upsert_rows(conn, rows):
+    """Upsert row tuples with one ``executemany`` per ``BATCH_SIZE`` chunk; the caller commits."""
+    count = 0
+    rows = iter(rows)
+    while chunk := list(islice(rows, BATCH_SIZE)):
+        conn.executemany(UPSERT_SQL, chunk)
+        count += len(chunk)
+    return count
+
+
+def count_videos(conn):
+    return conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+
+def ingest_records(conn, records):
+    """
+    Upsert records in a single transaction.
+
+    Args:
+        conn (sqlite3.Connection): Connection from ``connect``
+        records (Iterable[dict]): Dataset records
+
+    Returns:
+        int: Number of records processed
+    """
+    with conn:
+        return upsert_rows(conn, (to_row(record) for record in records))
+
+
+def ingest_file(conn, path, clean=True, totals=None):
+    """
+    Upsert every record of a CSV or Parquet dataset file in one transaction.
+
+    Args:
+        conn (sqlite3.Connection): Connection from ``connect``
+        path (str): Dataset file
+        clean (bool): Run the cleaning steps on each chunk first
+        totals (dict, optional): Per-step cleaning totals to accumulate into
+
+    Returns:
+        int: Number of rows upserted
+    """
+    if not clean:
+        return ingest_records(conn, iter_file_records(path))
+    with conn:
+        return sum(ingest_frame(conn, df, totals) for df in iter_file_frames(path))
+
+
+async def ingest_scraper(conn, scraper, clean=True, totals=None):
+    """
+    Upsert records straight from a scraper's record stream, as they arrive.
+
+    Records are buffered and committed every ``BATCH_SIZE`` records, so a long
+    scrape keeps what it has already loaded if it fails part-way.
+
+    Args:
+        conn (sqlite3.Connection): Connection from ``connect``
+        scraper (YouTubePlaylistScraper): Scraper to stream records from
+        clean (bool): Run the cleaning steps on each chunk first
+        totals (dict, optional): Per-step cleaning totals to accumulate into
+
+    Returns:
+        int: Number of rows upserted
+    """
+    buffer = []
+    count = 0
+
+    def flush():
+        with conn:
+            if clean:
+                return ingest_frame(conn, pd.DataFrame.from_records(buffer), totals)
+            return upsert_rows(conn, (to_row(record) for record in buffer))
+
+    async with scraper.transport:
+        async for records in scraper.iter_records():
+            buffer.extend(records)
+            if len(buffer) >= BATCH_SIZE:
+                count += flush()
+                buffer = []
+    if buffer:
+        count += flush()
+    return count
+
+
+def report(conn, processed, before, started, totals=None):
+    after = count_videos(conn)
+    for step, entry in (totals or {}).items():
+        removed = entry["rows_in"] - entry["rows_out"]
+        print(f"  🧹 {step}: removed {removed} rows ({entry['seconds'] * 1000:.1f} ms)")
+    print(f"✅ Processed {processed} rows in {time.perf_counter() - started:.2f}s")
+    print(f"   New videos: {after - before}")
+    print(f"   Updated videos: {processed - (after - before)}")
+    print(f"   Total videos in database: {after}")
+
+
+app = typer.Typer(help="Load scraper output into the SQLite videos database")
+
+DB_OPTION = typer.Option("data/videos.db", "--db", help="SQLite database path")
+CLEAN_OPTION = typer.Option(True, "--clean/--no-clean", help="Run the cleaning steps before loading")
+
+
+@app.command("file")
+def ingest_file_command(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False, help="CSV or Parquet dataset written by the scraper"),
+    db: str = DB_OPTION,
+    clean: bool = CLEAN_OPTION,
+):
+    """Ingest a scraper dataset file."""
+    conn = connect(db)
+    before, started, totals = count_videos(conn), time.perf_counter(), {}
+    print(f"📥 Ingesting {path} into {db}...")
+    processed = ingest_file(conn, path, clean, totals)
+    report(conn, processed, before, started, totals)
+    conn.close()
+
+
+@app.command("playlist")
+def ingest_playlist_command(
+    playlist_id: str = typer.Argument(..., help="YouTube playlist ID to scrape and ingest"),
+    db: str = DB_OPTION,
+    concurrency: int = typer.Option(8, help="Maximum number of API requests in flight"),
+    clean: bool = CLEAN_OPTION,
+):
+    """Scrape a playlist and stream its videos straight into the database."""
+    conn = connect(db)
+    before, started, totals = count_videos(conn), time.perf_counter(), {}
+    scraper = YouTubePlaylistScraper(
+        playlist_id=playlist_id,
+        api_key=load_api_key(),
+        scheduler=RequestScheduler(max_concurrency=concurrency),
+    )
+    print(f"📥 Streaming playlist {playlist_id} into {db}...")
+    processed = asyncio.run(ingest_scraper(conn, scraper, clean, totals))
+    report(conn, processed, before, started, totals)
+    conn.close()
+
+
+if __name__ == "__main__":
+    app()